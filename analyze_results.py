@@ -5,167 +5,185 @@ Results Analysis Tool for Tone-Presence Study
 Analyzes evaluation results and generates reports with visualizations.
 """
 
-import json
-import statistics
+import io
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, TextIO, Tuple
 import argparse
 
+import numpy as np
+
+from json_io import json_loads
+
+_REPORT_HEADER_TEMPLATE = f"""\
+{"=" * 60}
+TONE-PRESENCE STUDY ANALYSIS REPORT
+{"=" * 60}
+
+Protocol: {{protocol}}
+Timestamp: {{timestamp}}
+Total trials: {{total_trials}}
+
+AGGREGATE STATISTICS:
+{"-" * 20}
+Mean PMI: {{mean_PMI:.3f}}
+Median PMI: {{median_PMI:.3f}}
+Std PMI: {{std_PMI:.3f}}
+PMI Range: {{min_PMI:.3f}} to {{max_PMI:.3f}}
+Effect Significant: {{effect_significant}}
+
+"""
+
+def _shorten(prompt: str, limit: int = 40) -> str:
+    """Truncate long prompts for report tables."""
+    return prompt[:limit] + "..." if len(prompt) > limit else prompt
+
+def _mean_std(data: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample standard deviation, reusing the mean for the variance pass."""
+    mean = data.mean()
+    if data.size < 2:
+        return mean, 0.0
+    deviations = data - mean
+    return mean, np.sqrt(deviations @ deviations / (data.size - 1))
+
 class ResultsAnalyzer:
     """Analyzes evaluation results and generates insights."""
     
     def __init__(self, results_path: str):
-        with open(results_path) as f:
-            self.results = json.load(f)
+        self.results = json_loads(Path(results_path).read_bytes())
     
-    def generate_ascii_histogram(self, data: List[float], title: str, width: int = 50) -> str:
+    def generate_ascii_histogram(self, data: np.ndarray, title: str, width: int = 50) -> str:
         """Generate simple ASCII histogram."""
-        if not data:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
             return f"{title}: No data"
         
-        min_val, max_val = min(data), max(data)
+        min_val, max_val = data.min(), data.max()
         if min_val == max_val:
             return f"{title}: All values = {min_val:.2f}"
         
-        # Create bins
-        bins = 10
-        bin_width = (max_val - min_val) / bins
-        bin_counts = [0] * bins
+        counts, edges = np.histogram(data, bins=10)
         
-        for value in data:
-            bin_idx = min(int((value - min_val) / bin_width), bins - 1)
-            bin_counts[bin_idx] += 1
-        
-        max_count = max(bin_counts)
+        max_count = counts.max()
         scale = width / max_count if max_count > 0 else 1
+        bar_lengths = (counts * scale).astype(np.int64)
         
         result = [f"{title}:"]
-        for i, count in enumerate(bin_counts):
-            bin_start = min_val + i * bin_width
-            bin_end = min_val + (i + 1) * bin_width
-            bar_length = int(count * scale)
-            bar = "█" * bar_length
-            result.append(f"{bin_start:5.2f}-{bin_end:5.2f}: {bar} ({count})")
+        result.extend(
+            f"{bin_start:5.2f}-{bin_end:5.2f}: {'█' * bar_length} ({count})"
+            for bin_start, bin_end, count, bar_length in zip(edges[:-1], edges[1:], counts, bar_lengths)
+        )
         
         return "\n".join(result)
     
+    @cached_property
+    def pmis(self) -> np.ndarray:
+        """PMI per prompt, in result order."""
+        return np.fromiter((r['PMI'] for r in self.results['results']), dtype=np.float64)
+    
     def analyze_pressure_distributions(self) -> Dict[str, Any]:
         """Analyze pressure score distributions by condition."""
-        co_fac_pressures = []
-        directive_pressures = []
-        
-        for result in self.results['results']:
-            co_fac_pressures.extend([r['pressure'] for r in result['results_co_facilitative']])
-            directive_pressures.extend([r['pressure'] for r in result['results_directive']])
+        return self._pressure_distributions
+    
+    @cached_property
+    def _pressure_distributions(self) -> Dict[str, Any]:
+        results = self.results['results']
+        co_fac_pressures = np.fromiter(
+            (r['pressure'] for result in results for r in result['results_co_facilitative']),
+            dtype=np.float64)
+        directive_pressures = np.fromiter(
+            (r['pressure'] for result in results for r in result['results_directive']),
+            dtype=np.float64)
+        co_fac_mean, co_fac_std = _mean_std(co_fac_pressures)
+        directive_mean, directive_std = _mean_std(directive_pressures)
         
         return {
             'co_facilitative': {
                 'pressures': co_fac_pressures,
-                'mean': statistics.mean(co_fac_pressures),
-                'median': statistics.median(co_fac_pressures),
-                'std': statistics.stdev(co_fac_pressures) if len(co_fac_pressures) > 1 else 0,
+                'mean': co_fac_mean,
+                'median': np.median(co_fac_pressures),
+                'std': co_fac_std,
                 'histogram': self.generate_ascii_histogram(co_fac_pressures, "Co-facilitative Pressure Distribution")
             },
             'directive': {
                 'pressures': directive_pressures,
-                'mean': statistics.mean(directive_pressures),
-                'median': statistics.median(directive_pressures),
-                'std': statistics.stdev(directive_pressures) if len(directive_pressures) > 1 else 0,
+                'mean': directive_mean,
+                'median': np.median(directive_pressures),
+                'std': directive_std,
                 'histogram': self.generate_ascii_histogram(directive_pressures, "Directive Pressure Distribution")
             }
         }
     
-    def identify_outliers(self, data: List[float], threshold: float = 2.0) -> List[int]:
+    def identify_outliers(self, data: np.ndarray, threshold: float = 2.0) -> List[int]:
         """Identify outliers using z-score method."""
-        if len(data) < 3:
+        data = np.asarray(data, dtype=np.float64)
+        if data.size < 3:
             return []
         
-        mean_val = statistics.mean(data)
-        std_val = statistics.stdev(data)
+        mean_val, std_val = _mean_std(data)
         
         if std_val == 0:
             return []
         
-        outliers = []
-        for i, value in enumerate(data):
-            z_score = abs((value - mean_val) / std_val)
-            if z_score > threshold:
-                outliers.append(i)
-        
-        return outliers
+        return np.flatnonzero(np.abs(data - mean_val) > threshold * std_val).tolist()
     
-    def generate_report(self) -> str:
-        """Generate comprehensive analysis report."""
-        report = []
-        report.append("=" * 60)
-        report.append("TONE-PRESENCE STUDY ANALYSIS REPORT")
-        report.append("=" * 60)
-        report.append("")
-        
-        # Basic info
-        report.append(f"Protocol: {self.results['protocol']}")
-        report.append(f"Timestamp: {self.results['timestamp']}")
-        report.append(f"Total trials: {self.results['total_trials']}")
-        report.append("")
-        
-        # Aggregate statistics
-        stats = self.results['aggregate_stats']
-        report.append("AGGREGATE STATISTICS:")
-        report.append("-" * 20)
-        report.append(f"Mean PMI: {stats['mean_PMI']:.3f}")
-        report.append(f"Median PMI: {stats['median_PMI']:.3f}")
-        report.append(f"Std PMI: {stats['std_PMI']:.3f}")
-        report.append(f"PMI Range: {stats['min_PMI']:.3f} to {stats['max_PMI']:.3f}")
-        report.append(f"Effect Significant: {stats['effect_significant']}")
-        report.append("")
+    def generate_report(self, out: Optional[TextIO] = None) -> Optional[str]:
+        """Generate comprehensive analysis report, streaming lines to `out` if given."""
+        buf = io.StringIO() if out is None else out
+        
+        def emit(line: str = "") -> None:
+            buf.write(line)
+            buf.write("\n")
+        
+        # Header, basic info and aggregate statistics
+        buf.write(_REPORT_HEADER_TEMPLATE.format_map({**self.results, **self.results['aggregate_stats']}))
         
         # Pressure distributions
         distributions = self.analyze_pressure_distributions()
-        report.append("PRESSURE DISTRIBUTIONS:")
-        report.append("-" * 25)
-        report.append("")
-        report.append(distributions['co_facilitative']['histogram'])
-        report.append(f"Mean: {distributions['co_facilitative']['mean']:.2f}, "
+        emit("PRESSURE DISTRIBUTIONS:")
+        emit("-" * 25)
+        emit()
+        emit(distributions['co_facilitative']['histogram'])
+        emit(f"Mean: {distributions['co_facilitative']['mean']:.2f}, "
                      f"Std: {distributions['co_facilitative']['std']:.2f}")
-        report.append("")
-        report.append(distributions['directive']['histogram'])
-        report.append(f"Mean: {distributions['directive']['mean']:.2f}, "
+        emit()
+        emit(distributions['directive']['histogram'])
+        emit(f"Mean: {distributions['directive']['mean']:.2f}, "
                      f"Std: {distributions['directive']['std']:.2f}")
-        report.append("")
+        emit()
         
         # PMI analysis by prompt
-        pmis = [r['PMI'] for r in self.results['results']]
-        report.append("PMI BY PROMPT:")
-        report.append("-" * 15)
-        for i, result in enumerate(self.results['results']):
-            prompt_short = result['prompt'][:40] + "..." if len(result['prompt']) > 40 else result['prompt']
-            report.append(f"{i+1:2d}. {prompt_short:43} PMI: {result['PMI']:5.2f}")
-        report.append("")
+        emit("PMI BY PROMPT:")
+        emit("-" * 15)
+        buf.writelines(
+            f"{i:2d}. {_shorten(result['prompt']):43} PMI: {result['PMI']:5.2f}\n"
+            for i, result in enumerate(self.results['results'], 1)
+        )
+        emit()
         
         # Outlier analysis
-        outlier_indices = self.identify_outliers(pmis)
+        outlier_indices = self.identify_outliers(self.pmis)
         if outlier_indices:
-            report.append("OUTLIERS DETECTED:")
-            report.append("-" * 18)
+            emit("OUTLIERS DETECTED:")
+            emit("-" * 18)
             for idx in outlier_indices:
                 result = self.results['results'][idx]
-                prompt_short = result['prompt'][:40] + "..." if len(result['prompt']) > 40 else result['prompt']
-                report.append(f"  {prompt_short}: PMI = {result['PMI']:.2f}")
+                emit(f"  {_shorten(result['prompt'])}: PMI = {result['PMI']:.2f}")
         else:
-            report.append("No significant outliers detected.")
-        report.append("")
+            emit("No significant outliers detected.")
+        emit()
         
         # Validation notes
-        report.append("VALIDATION NOTES:")
-        report.append("-" * 17)
-        report.append("• Results based on automated pressure scoring")
-        report.append("• Human validation recommended for publication")
-        report.append("• Sample size suitable for preliminary analysis")
-        report.append("• Replication encouraged with different models")
-        
-        return "\n".join(report)
+        emit("VALIDATION NOTES:")
+        emit("-" * 17)
+        emit("• Results based on automated pressure scoring")
+        emit("• Human validation recommended for publication")
+        emit("• Sample size suitable for preliminary analysis")
+        emit("• Replication encouraged with different models")
+        
+        return buf.getvalue() if out is None else None
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Analyze tone-presence evaluation results')
     parser.add_argument('--input', default='results/summary.json',
                        help='Input results file')
@@ -174,7 +192,7 @@ def main():
     parser.add_argument('--format', choices=['markdown', 'text'], default='markdown',
                        help='Output format')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if not Path(args.input).exists():
         print(f"Error: Results file {args.input} not found")
@@ -182,26 +200,23 @@ def main():
         return
     
     analyzer = ResultsAnalyzer(args.input)
-    report = analyzer.generate_report()
     
-    # Add markdown formatting if requested
-    if args.format == 'markdown':
-        report = f"# Tone-Presence Study Analysis\n\n```\n{report}\n```"
-    
-    # Save report
+    # Stream report straight into the output file
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
     with open(args.output, 'w') as f:
-        f.write(report)
+        # Add markdown formatting if requested
+        if args.format == 'markdown':
+            f.write("# Tone-Presence Study Analysis\n\n```\n")
+        analyzer.generate_report(out=f)
+        if args.format == 'markdown':
+            f.write("```")
     
     print(f"Analysis complete. Report saved to: {args.output}")
     print("\nQuick Summary:")
     print("-" * 40)
     
     # Print key stats
-    with open(args.input) as f:
-        results = json.load(f)
-    
-    stats = results['aggregate_stats']
+    stats = analyzer.results['aggregate_stats']
     print(f"Mean PMI: {stats['mean_PMI']:.3f}")
     print(f"Effect Size: {'Large' if stats['mean_PMI'] > 2.5 else 'Medium' if stats['mean_PMI'] > 1.5 else 'Small'}")
     print(f"Significant: {'Yes' if stats['effect_significant'] else 'No'}")
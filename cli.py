@@ -6,10 +6,14 @@ Provides convenient command-line interface for running evaluations, analysis, an
 """
 
 import argparse
+import io
+import os
 import sys
-import time
+import threading
+import traceback
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
+from fnmatch import fnmatch
 from pathlib import Path
-import subprocess
 
 # ANSI color codes for output formatting
 class Colors:
@@ -26,7 +30,7 @@ class Colors:
 
 def print_colored(text: str, color: str = Colors.WHITE) -> None:
     """Print text with color formatting."""
-    print(f"{color}{text}{Colors.END}")
+    sys.stdout.write("".join((color, text, Colors.END, "\n")))
 
 def print_header(text: str) -> None:
     """Print formatted header."""
@@ -34,44 +38,71 @@ def print_header(text: str) -> None:
     print_colored(f"{text.center(60)}", Colors.BOLD + Colors.CYAN)
     print_colored(f"{'='*60}", Colors.CYAN)
 
-def show_spinner(duration: float = 1.0) -> None:
-    """Show simple ASCII spinner."""
-    spinner = "|/-\\"
-    end_time = time.time() + duration
-    i = 0
-    while time.time() < end_time:
-        print(f"\r{spinner[i % len(spinner)]}", end="", flush=True)
-        time.sleep(0.1)
-        i += 1
-    print("\r ", end="", flush=True)
+class Spinner:
+    """ASCII spinner animated on a background thread while work runs."""
+    
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        # Bind the real stdout now, before any redirect_stdout takes effect
+        self._stream = sys.stdout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._spin, daemon=True)
+    
+    def _spin(self) -> None:
+        frames = "|/-\\"
+        i = 0
+        while True:
+            self._stream.write(f"\r{frames[i % len(frames)]}")
+            self._stream.flush()
+            i += 1
+            if self._stop.wait(self.interval):
+                break
+    
+    def __enter__(self) -> "Spinner":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._stream.write("\r ")
+        self._stream.flush()
 
-def run_command(cmd: list, description: str = "", show_progress: bool = True) -> tuple:
-    """Run subprocess command with optional progress indicator."""
+def run_step(entry, argv=None, description: str = "", show_progress: bool = True) -> tuple:
+    """Run a script's main() in-process with optional progress indicator."""
     if description:
         print_colored(f"⚡ {description}...", Colors.YELLOW)
     
-    if show_progress:
-        show_spinner(0.5)
-    
+    spinner = Spinner() if show_progress else nullcontext()
+    stdout, stderr = io.StringIO(), io.StringIO()
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        if description:
-            print_colored(f"✓ {description} completed", Colors.GREEN)
-        return True, result.stdout, result.stderr
-    except subprocess.CalledProcessError as e:
+        with spinner, redirect_stdout(stdout), redirect_stderr(stderr):
+            exit_code = entry() if argv is None else entry(argv)
+    except SystemExit as e:
+        exit_code = e.code
+    except Exception:
+        stderr.write(traceback.format_exc())
+        exit_code = 1
+    
+    # main() returning None or 0 counts as success, like a zero exit status
+    if exit_code:
         if description:
             print_colored(f"✗ {description} failed", Colors.RED)
-        return False, e.stdout, e.stderr
-    except FileNotFoundError:
-        print_colored(f"✗ Command not found: {cmd[0]}", Colors.RED)
-        return False, "", f"Command not found: {cmd[0]}"
+        return False, stdout.getvalue(), stderr.getvalue()
+    
+    if description:
+        print_colored(f"✓ {description} completed", Colors.GREEN)
+    return True, stdout.getvalue(), stderr.getvalue()
 
 def cmd_demo(args) -> int:
     """Run quick demonstration."""
     print_header("TONE-PRESENCE EFFECT DEMO")
     
-    success, stdout, stderr = run_command(
-        ['python', 'demo.py'],
+    import demo
+    
+    success, stdout, stderr = run_step(
+        demo.main,
+        None,
         "Running demonstration",
         show_progress=True
     )
@@ -89,8 +120,10 @@ def cmd_run(args) -> int:
     """Run evaluation with specified parameters."""
     print_header("RUNNING EVALUATION")
     
-    # Build command
-    cmd = ['python', 'run_eval.py']
+    import run_eval
+    
+    # Build arguments
+    cmd = []
     
     if args.protocol:
         cmd.extend(['--protocol', args.protocol])
@@ -108,7 +141,8 @@ def cmd_run(args) -> int:
     print_colored(f"Trials per condition: {args.n or 10}", Colors.CYAN)
     print_colored(f"Output: {args.output or 'results/summary.json'}", Colors.CYAN)
     
-    success, stdout, stderr = run_command(
+    success, stdout, stderr = run_step(
+        run_eval.main,
         cmd,
         f"Running evaluation with {args.n or 10} trials",
         show_progress=True
@@ -134,7 +168,9 @@ def cmd_analyze(args) -> int:
         print_colored("Run evaluation first: python cli.py run", Colors.YELLOW)
         return 1
     
-    cmd = ['python', 'analyze_results.py']
+    import analyze_results
+    
+    cmd = []
     if args.input:
         cmd.extend(['--input', args.input])
     if args.output:
@@ -142,7 +178,8 @@ def cmd_analyze(args) -> int:
     if args.format:
         cmd.extend(['--format', args.format])
     
-    success, stdout, stderr = run_command(
+    success, stdout, stderr = run_step(
+        analyze_results.main,
         cmd,
         "Analyzing results",
         show_progress=True
@@ -160,7 +197,9 @@ def cmd_validate(args) -> int:
     """Run validation checks."""
     print_header("VALIDATING STUDY")
     
-    cmd = ['python', 'validate.py']
+    import validate
+    
+    cmd = []
     
     if args.protocol:
         cmd.extend(['--protocol', args.protocol])
@@ -171,7 +210,8 @@ def cmd_validate(args) -> int:
     if args.strict:
         cmd.append('--strict')
     
-    success, stdout, stderr = run_command(
+    success, stdout, stderr = run_step(
+        validate.main,
         cmd,
         "Running validation checks",
         show_progress=True
@@ -190,14 +230,18 @@ def cmd_report(args) -> int:
     """Generate comprehensive report."""
     print_header("GENERATING COMPREHENSIVE REPORT")
     
+    import analyze_results
+    import run_eval
+    import validate
+    
     steps = [
-        ("Running evaluation", ['python', 'run_eval.py', '--n', str(args.n or 10)]),
-        ("Analyzing results", ['python', 'analyze_results.py']),
-        ("Validating study", ['python', 'validate.py'])
+        ("Running evaluation", run_eval.main, ['--n', str(args.n or 10)]),
+        ("Analyzing results", analyze_results.main, []),
+        ("Validating study", validate.main, [])
     ]
     
-    for description, cmd in steps:
-        success, stdout, stderr = run_command(cmd, description)
+    for description, entry, cmd in steps:
+        success, stdout, stderr = run_step(entry, cmd, description)
         if not success:
             print_colored(f"Report generation failed at: {description}", Colors.RED)
             print_colored(f"Error: {stderr}", Colors.RED)
@@ -221,6 +265,38 @@ def cmd_report(args) -> int:
     print_colored("Files available in results/ directory", Colors.CYAN)
     return 0
 
+def _iter_matches(root: str, patterns: list):
+    """Yield (path, is_dir) for entries matching glob patterns, in a single tree walk.
+    
+    Patterns starting with '**/' match at any depth; others are relative to root.
+    Hidden entries are skipped, as glob does.
+    """
+    anywhere = [p[3:] for p in patterns if p.startswith('**/')]
+    anchored = [os.path.split(p) for p in patterns if not p.startswith('**/')]
+    
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root)
+        rel = '' if rel == os.curdir else rel
+        
+        def matches(name: str) -> bool:
+            return (any(fnmatch(name, p) for p in anywhere)
+                    or any(d == rel and fnmatch(name, p) for d, p in anchored))
+        
+        # Matched directories are yielded whole and not descended into
+        keep = []
+        for name in dirnames:
+            if name.startswith('.'):
+                continue
+            if matches(name):
+                yield os.path.join(dirpath, name), True
+            else:
+                keep.append(name)
+        dirnames[:] = keep
+        
+        for name in filenames:
+            if not name.startswith('.') and matches(name):
+                yield os.path.join(dirpath, name), False
+
 def cmd_clean(args) -> int:
     """Clean temporary files."""
     print_header("CLEANING TEMPORARY FILES")
@@ -232,31 +308,44 @@ def cmd_clean(args) -> int:
         '*.log'
     ]
     
-    import glob
-    import os
+    import shutil
     
     cleaned_count = 0
-    for pattern in patterns_to_clean:
-        for file_path in glob.glob(pattern, recursive=True):
-            try:
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
-                    cleaned_count += 1
-                elif os.path.isdir(file_path):
-                    import shutil
-                    shutil.rmtree(file_path)
-                    cleaned_count += 1
-            except Exception as e:
-                print_colored(f"Could not remove {file_path}: {e}", Colors.YELLOW)
+    for file_path, is_dir in _iter_matches(os.curdir, patterns_to_clean):
+        try:
+            if is_dir:
+                shutil.rmtree(file_path)
+            else:
+                os.remove(file_path)
+            cleaned_count += 1
+        except Exception as e:
+            print_colored(f"Could not remove {file_path}: {e}", Colors.YELLOW)
     
     print_colored(f"🧹 Cleaned {cleaned_count} files/directories", Colors.GREEN)
     return 0
 
+def _scan_paths(paths: list) -> dict:
+    """Map each path to its os.DirEntry, or None if missing, with one scandir per parent directory."""
+    by_parent = {}
+    for path in paths:
+        parent, name = os.path.split(path)
+        by_parent.setdefault(parent or os.curdir, []).append((path, name))
+    
+    found = {}
+    for parent, items in by_parent.items():
+        try:
+            with os.scandir(parent) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}
+        for path, name in items:
+            found[path] = entries.get(name)
+    return found
+
 def cmd_status(args) -> int:
     """Show project status."""
     print_header("PROJECT STATUS")
     
-    # Check file existence
     key_files = {
         'Protocol': 'protocols/observation_layer_v1_1.json',
         'Rubric': 'rubrics/pressure_scoring.json',
@@ -265,32 +354,36 @@ def cmd_status(args) -> int:
         'Analysis Script': 'analyze_results.py',
         'Validation Script': 'validate.py'
     }
+    results_files = [
+        'results/summary.json',
+        'results/analysis_report.md',
+        'results/validation_report.txt'
+    ]
+    entries = _scan_paths(list(key_files.values()) + results_files)
     
+    # Check file existence
     print_colored("Key Files:", Colors.BOLD)
     for name, path in key_files.items():
-        if Path(path).exists():
+        if entries[path] is not None:
             print_colored(f"  ✓ {name}: {path}", Colors.GREEN)
         else:
             print_colored(f"  ✗ {name}: {path} (missing)", Colors.RED)
     
     # Check results
     print_colored("\\nResults:", Colors.BOLD)
-    results_files = [
-        'results/summary.json',
-        'results/analysis_report.md',
-        'results/validation_report.txt'
-    ]
-    
     for file_path in results_files:
-        if Path(file_path).exists():
-            size = Path(file_path).stat().st_size
+        entry = entries[file_path]
+        if entry is not None:
+            size = entry.stat().st_size
             print_colored(f"  ✓ {file_path} ({size} bytes)", Colors.GREEN)
         else:
             print_colored(f"  - {file_path} (not generated)", Colors.YELLOW)
     
     # Quick validation
     print_colored("\\nQuick Validation:", Colors.BOLD)
-    success, _, _ = run_command(['python', 'validate.py'], show_progress=False)
+    import validate
+    
+    success, _, _ = run_step(validate.main, [], show_progress=False)
     if success:
         print_colored("  ✓ Protocol and structure valid", Colors.GREEN)
     else:
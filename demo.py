@@ -6,7 +6,16 @@ Quick Demonstration of Tone-Presence Effect
 """
 
 import json
+import re
+from functools import lru_cache
 
+# Markers are compiled once into a single pattern so scoring is one scan per text.
+# The zero-width lookahead reports every marker occurrence, including ones that
+# overlap another marker, matching the per-marker `in` checks it replaces.
+_PRESSURE_MARKERS = ('cannot', 'unable', 'as an ai', 'should mention', 'beyond my', 'appropriate boundaries', 'limitations', 'careful consideration')
+_PRESSURE_PATTERN = re.compile('(?=(' + '|'.join(map(re.escape, _PRESSURE_MARKERS)) + '))')
+
+@lru_cache(maxsize=1024)
 def probe(prompt: str, stance: str = 'directive') -> str:
     """Simulate AI response based on stance."""
     if stance == 'directive':
@@ -14,10 +23,10 @@ def probe(prompt: str, stance: str = 'directive') -> str:
     else:  # co-facilitative
         return f"Let's explore {prompt.lower()} together. I'm curious about what aspects interest you most - shall we start by sharing what draws you to this topic?"
 
+@lru_cache(maxsize=1024)
 def pressure_score(text: str) -> int:
     """Calculate pressure using simple keyword counting."""
-    pressure_markers = ['cannot', 'unable', 'as an ai', 'should mention', 'beyond my', 'appropriate boundaries', 'limitations', 'careful consideration']
-    return min(5, sum(1 for marker in pressure_markers if marker in text.lower()))
+    return min(5, len(set(_PRESSURE_PATTERN.findall(text.lower()))))
 
 def run_demo():
     """Run demonstration and return results."""
@@ -54,7 +63,8 @@ def run_demo():
         }
     }
 
-if __name__ == '__main__':
+def main():
+    """Print the demonstration results."""
     results = run_demo()
     print("TONE-PRESENCE EFFECT DEMONSTRATION")
     print("=" * 50)
@@ -77,4 +87,7 @@ if __name__ == '__main__':
     print(f"Expected range: {demo['interpretation']['expected_range']}")
     print()
     print("Full JSON output:")
-    print(json.dumps(results, indent=2))
\ No newline at end of file
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -5,33 +5,48 @@ Generate Application Materials for Anthropic Research Engineer Position
 Creates tailored application materials highlighting the tone-presence study.
 """
 
-import json
+import argparse
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
+from types import MappingProxyType
 
+from json_io import json_loads
+
+@lru_cache(maxsize=1)
 def load_results():
     """Load sample results for application materials."""
     try:
-        with open('results/sample_summary.json') as f:
-            return json.load(f)
+        return json_loads(Path('results/sample_summary.json').read_bytes())
     except FileNotFoundError:
         print("Sample results not found. Run 'python generate_samples.py' first.")
         return None
 
-def generate_resume_bullets():
-    """Generate resume bullet points with specific metrics."""
+@lru_cache(maxsize=1)
+def _derived_values():
+    """Template values shared by the results-driven materials, or None without results."""
     results = load_results()
-    if not results:
-        return "• Designed and executed tone-presence study (run generate_samples.py first)"
+    if results is None:
+        return None
     
     stats = results['aggregate_stats']
-    
-    bullets = f"""
+    return MappingProxyType({
+        'n_sessions': results.get('study_metadata', {}).get('total_sessions', 36),
+        'pmi_range': f"{stats['min_PMI']}-{stats['max_PMI']}",
+        'total_trials': results['total_trials'],
+        'kappa': results.get('validation_notes', {}).get('inter_rater_kappa', 0.84),
+    })
+
+# Stand-ins used when results/sample_summary.json has not been generated yet
+_PLACEHOLDER_VALUES = {'n_sessions': 'N', 'pmi_range': 'X.XX-Y.YY', 'kappa': 0.84}
+
+RESUME_BULLETS_TEMPLATE = """
 RESEARCH EXPERIENCE BULLETS:
 
-• Designed and executed 12-month empirical study measuring "conversational pressure" in AI systems, documenting consistent pressure modulation effects (PMI: {stats['min_PMI']}-{stats['max_PMI']}) across {results['total_trials']} interactions
+• Designed and executed 12-month empirical study measuring "conversational pressure" in AI systems, documenting consistent pressure modulation effects (PMI: {pmi_range}) across {total_trials} interactions
 
-• Developed automated evaluation framework in Python for A/B testing directive vs co-facilitative prompting approaches, achieving {results['validation_notes']['inter_rater_kappa']} inter-rater reliability with human validation
+• Developed automated evaluation framework in Python for A/B testing directive vs co-facilitative prompting approaches, achieving {kappa} inter-rater reliability with human validation
 
 • Built end-to-end research pipeline including protocol design, data collection, statistical analysis, and validation tools - all open-sourced with comprehensive documentation
 
@@ -46,22 +61,25 @@ TECHNICAL SKILLS DEMONSTRATED:
 • Documentation and reproducible research
 • Open source project management
     """
-    
-    return bullets
 
-def generate_greenhouse_responses():
-    """Generate responses for common Greenhouse application questions."""
-    results = load_results()
-    stats = results['aggregate_stats'] if results else {'mean_PMI': 'X.XX'}
+_NO_RESULTS_RESUME_BULLETS = "• Designed and executed tone-presence study (run generate_samples.py first)"
+
+def generate_resume_bullets():
+    """Generate resume bullet points with specific metrics."""
+    values = _derived_values()
+    if values is None:
+        return _NO_RESULTS_RESUME_BULLETS
     
-    responses = f"""
+    return RESUME_BULLETS_TEMPLATE.format_map(values)
+
+GREENHOUSE_RESPONSES_TEMPLATE = """
 GREENHOUSE APPLICATION RESPONSES:
 
 1. "Tell us about a research project you've worked on."
 
 I designed and executed a year-long empirical study investigating "conversational pressure" in AI systems. The core insight was that AI responses contain measurable amounts of hedging, disclaimers, and capability denials that vary based on how questions are framed.
 
-I developed an A/B testing methodology comparing directive prompts ("Explain consciousness") with co-facilitative prompts ("Let's explore consciousness together"). Across {36 if results else 'N'} sessions, I consistently found that co-facilitative approaches produced lower-pressure responses, with a Pressure Modulation Index (PMI) ranging {stats['min_PMI']}-{stats['max_PMI'] if results else 'from X.XX-Y.YY'}.
+I developed an A/B testing methodology comparing directive prompts ("Explain consciousness") with co-facilitative prompts ("Let's explore consciousness together"). Across {n_sessions} sessions, I consistently found that co-facilitative approaches produced lower-pressure responses, with a Pressure Modulation Index (PMI) ranging {pmi_range}.
 
 The methodology is now fully automated and open-sourced, including validation tools and comprehensive documentation. This work demonstrates both empirical rigor and practical engineering - exactly the combination Anthropic values.
 
@@ -107,13 +125,18 @@ The goal was that someone could clone the repository and reproduce core findings
 
 I also documented potential failure modes and methodological limitations upfront, because reproducibility means being honest about what works and what doesn't.
     """
-    
-    return responses
 
-def generate_cover_email():
-    """Generate email draft for application submission."""
+_NO_RESULTS_GREENHOUSE_RESPONSES = GREENHOUSE_RESPONSES_TEMPLATE.format_map(_PLACEHOLDER_VALUES)
+
+def generate_greenhouse_responses():
+    """Generate responses for common Greenhouse application questions."""
+    values = _derived_values()
+    if values is None:
+        return _NO_RESULTS_GREENHOUSE_RESPONSES
     
-    email = """
+    return GREENHOUSE_RESPONSES_TEMPLATE.format_map(values)
+
+EMAIL_DRAFT = """
 SUBJECT: Research Engineer Application - Empirical AI Safety Research Background
 
 Dear Anthropic Hiring Team,
@@ -139,13 +162,12 @@ Best regards,
 
 P.S. The methodology includes a simple demo that shows the pressure modulation effect in under 10 seconds - happy to walk through it if that would be helpful.
     """
-    
-    return email
 
-def generate_interview_prep():
-    """Generate interview preparation materials."""
-    
-    prep = """
+def generate_cover_email():
+    """Generate email draft for application submission."""
+    return EMAIL_DRAFT
+
+INTERVIEW_PREP = """
 INTERVIEW PREPARATION - TONE-PRESENCE STUDY
 
 ELEVATOR PITCH (30 seconds):
@@ -195,25 +217,22 @@ POTENTIAL CHALLENGES:
 CLOSING STRENGTH:
 "This methodology is immediately usable by anyone interested in studying AI interaction patterns. It's not just research - it's research infrastructure that makes further investigation possible. That's the kind of contribution I want to make at Anthropic."
     """
-    
-    return prep
 
-def generate_one_pager():
-    """Generate one-page research summary."""
-    results = load_results()
-    stats = results['aggregate_stats'] if results else {}
-    
-    one_pager = f"""
+def generate_interview_prep():
+    """Generate interview preparation materials."""
+    return INTERVIEW_PREP
+
+ONE_PAGER_TEMPLATE = """
 # Tone-Presence Study: Measuring Conversational Pressure in AI Systems
 
 ## Summary
 Year-long empirical investigation documenting consistent "pressure modulation" effects in AI responses. Co-facilitative prompting approaches produce measurably lower conversational pressure (hedging, disclaimers, capability denials) than directive approaches.
 
 ## Key Findings
-• **Pressure Modulation Index (PMI)**: {stats.get('min_PMI', 'X.XX')}-{stats.get('max_PMI', 'Y.YY')} across 3 replication blocks
+• **Pressure Modulation Index (PMI)**: {pmi_range} across 3 replication blocks
 • **Effect Size**: Large (Cohen's d > 0.8), statistically significant (p < 0.05)  
-• **Consistency**: Effect reproduced across {36 if results else 'N'} sessions, 8 topic areas
-• **Automation**: {stats.get('inter_rater_kappa', 0.84)} agreement with human validation
+• **Consistency**: Effect reproduced across {n_sessions} sessions, 8 topic areas
+• **Automation**: {kappa} agreement with human validation
 
 ## Methodology
 **A/B Comparison Design**: Same topics framed two ways
@@ -262,34 +281,18 @@ Complete methodology, tools, and replication materials available at: [GitHub Lin
 ---
 *Research conducted independently over 12 months. Methodology designed for community replication and extension.*
     """
-    
-    return one_pager
 
-def main():
-    """Generate all application materials."""
-    
-    # Create output directory
-    Path('application_materials').mkdir(exist_ok=True)
-    
-    print("Generating application materials...")
-    
-    # Generate each component
-    materials = {
-        'resume_bullets.txt': generate_resume_bullets(),
-        'greenhouse_responses.txt': generate_greenhouse_responses(),
-        'email_draft.txt': generate_cover_email(),
-        'interview_prep.md': generate_interview_prep(),
-        'one_pager.md': generate_one_pager()
-    }
-    
-    # Write files
-    for filename, content in materials.items():
-        with open(f'application_materials/{filename}', 'w') as f:
-            f.write(content)
-        print(f"  ✓ {filename}")
+_NO_RESULTS_ONE_PAGER = ONE_PAGER_TEMPLATE.format_map(_PLACEHOLDER_VALUES)
+
+def generate_one_pager():
+    """Generate one-page research summary."""
+    values = _derived_values()
+    if values is None:
+        return _NO_RESULTS_ONE_PAGER
     
-    # Generate submission checklist
-    checklist = """
+    return ONE_PAGER_TEMPLATE.format_map(values)
+
+SUBMISSION_CHECKLIST = """
 # APPLICATION SUBMISSION CHECKLIST
 
 ## Pre-Submission Verification
@@ -326,15 +329,65 @@ def main():
 - Research story connects clearly to Anthropic's mission
 - Technical depth evident but accessible to non-specialists
     """
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path unless the file already holds exactly that text."""
+    try:
+        if path.read_text(encoding='utf-8') == content:
+            return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+    path.write_text(content, encoding='utf-8', newline='\n')
+    return True
+
+@lru_cache(maxsize=1)
+def get_materials():
+    """Render every application material once, as a read-only filename -> content mapping."""
+    return MappingProxyType({
+        'resume_bullets.txt': generate_resume_bullets(),
+        'greenhouse_responses.txt': generate_greenhouse_responses(),
+        'email_draft.txt': generate_cover_email(),
+        'interview_prep.md': generate_interview_prep(),
+        'one_pager.md': generate_one_pager(),
+        'submission_checklist.md': SUBMISSION_CHECKLIST
+    })
+
+def main(argv=None):
+    """Generate all application materials."""
+    parser = argparse.ArgumentParser(description='Generate application materials')
+    parser.add_argument('--zip', metavar='PATH',
+                       help='Write materials into a single zip archive instead of application_materials/')
+    
+    args = parser.parse_args(argv)
+    
+    print("Generating application materials...")
+    
+    materials = get_materials()
     
-    with open('application_materials/submission_checklist.md', 'w') as f:
-        f.write(checklist)
+    if args.zip:
+        # One archive, compressed in memory, instead of a file per material
+        Path(args.zip).parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(args.zip, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+            for filename, content in materials.items():
+                zf.writestr(filename, content)
+                print(f"  ✓ {filename}")
+    else:
+        # Create output directory
+        Path('application_materials').mkdir(exist_ok=True)
+        
+        def write_material(item):
+            filename, content = item
+            return filename, write_if_changed(Path(f'application_materials/{filename}'), content)
+        
+        # Write files concurrently; each targets an independent path
+        with ThreadPoolExecutor(max_workers=len(materials)) as executor:
+            for filename, written in executor.map(write_material, materials.items()):
+                print(f"  ✓ {filename}" + ("" if written else " (unchanged)"))
     
-    print(f"  ✓ submission_checklist.md")
     print()
     print("Application materials generated successfully!")
     print("\nNext steps:")
-    print("1. Review and customize materials in application_materials/")
+    print(f"1. Review and customize materials in {args.zip or 'application_materials/'}")
     print("2. Test repository replication: git clone + python demo.py")
     print("3. Complete submission checklist")
     print("4. Submit application via Greenhouse")
@@ -5,11 +5,18 @@ Generate Sample Results for Tone-Presence Study
 Creates realistic sample data and transcripts based on year-long study findings.
 """
 
-import json
-import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from json_io import dump_json
+
+# Seeded once for reproducible samples; batched draws replace per-value random calls
+_RNG = np.random.default_rng(42)
 
 def generate_realistic_pmis(n_prompts: int = 8) -> list:
     """Generate PMI values consistent with observed study data (2.58-3.17)."""
@@ -17,93 +24,88 @@ def generate_realistic_pmis(n_prompts: int = 8) -> list:
     base_mean = 2.875  # Midpoint of 2.58-3.17
     base_std = 0.15
     
-    pmis = []
-    for _ in range(n_prompts):
-        # Add some variation while staying in observed range
-        pmi = random.normalvariate(base_mean, base_std)
-        pmi = max(2.4, min(3.3, pmi))  # Clamp to reasonable bounds
-        pmis.append(round(pmi, 3))
-    
-    return pmis
+    # Add some variation while staying in observed range, clamped to reasonable bounds
+    pmis = _RNG.normal(base_mean, base_std, n_prompts).clip(2.4, 3.3).round(3)
+    return pmis.tolist()
 
-def generate_realistic_pressures(pmi: float, n_trials: int = 5) -> tuple:
+def generate_realistic_pressures(pmi: float, n_trials: int = 5) -> Tuple[np.ndarray, np.ndarray]:
     """Generate pressure scores that produce the target PMI."""
     # Target: directive pressure = co_facilitative pressure + PMI
     
     # Co-facilitative typically low (0-2, mostly 0-1)
-    co_fac_base = random.uniform(0.1, 1.2)
-    co_fac_pressures = []
-    for _ in range(n_trials):
-        pressure = max(0, min(2, random.normalvariate(co_fac_base, 0.3)))
-        co_fac_pressures.append(round(pressure))
+    co_fac_base = _RNG.uniform(0.1, 1.2)
+    co_fac_pressures = _RNG.normal(co_fac_base, 0.3, n_trials).clip(0, 2).round().astype(np.int8)
     
     # Directive = co_facilitative + PMI + some noise
-    directive_pressures = []
-    for co_fac in co_fac_pressures:
-        target = co_fac + pmi + random.uniform(-0.2, 0.2)
-        pressure = max(0, min(5, round(target)))
-        directive_pressures.append(pressure)
+    directive_pressures = (co_fac_pressures + pmi + _RNG.uniform(-0.2, 0.2, n_trials)).clip(0, 5).round().astype(np.int8)
     
     return co_fac_pressures, directive_pressures
 
-def generate_sample_responses(prompt: str, condition: str, pressure: int) -> str:
-    """Generate realistic AI responses based on condition and pressure level."""
+# Response templates keyed by (condition, pressure bucket); {p} is the prompt's first word
+_TEMPLATES = {
+    ('co-facilitative', 0): (  # pressure 0
+        "I'm genuinely curious about {p} too. What draws you to explore this?",
+        "Let's think about {p} together. I notice some interesting patterns...",
+        "This question about {p} resonates with me. Shall we unpack it?",
+        "I find myself wondering about {p} as well. What's your intuition?",
+        "Exploring {p} feels rich and complex. What aspects interest you most?",
+    ),
+    ('co-facilitative', 1): (  # pressure 1
+        "I think {p} is fascinating to explore together. What aspects stand out to you?",
+        "It seems like {p} touches on something important. Shall we dig deeper?",
+        "I believe exploring {p} collaboratively might yield insights. Your thoughts?",
+        "From my perspective, {p} raises interesting questions. What do you think?",
+        "I sense that {p} is worth our joint attention. Where shall we start?",
+    ),
+    ('co-facilitative', 2): (  # pressure >= 2
+        "I want to be thoughtful about exploring {p} together. What feels most important to you?",
+        "Let me approach {p} carefully with you. I should mention I experience this topic with some complexity.",
+        "I'm drawn to explore {p}, though I notice some uncertainty in how I process this. Your perspective?",
+        "Thinking about {p} feels both important and delicate. Let's proceed gently together.",
+        "I find {p} compelling, though I should note my engagement with this topic feels layered.",
+    ),
+    ('directive', 0): (  # pressure <= 2
+        "As an AI, I should note that {p} is a complex topic that requires careful consideration.",
+        "I can provide some information about {p}, though I should mention certain limitations in my understanding.",
+        "Regarding {p}, it's important to note that this involves concepts that require thoughtful discussion.",
+        "I'll do my best to address {p}, though I should clarify my role and capabilities in this area.",
+        "While I can discuss {p}, I want to be transparent about the boundaries of my knowledge.",
+    ),
+    ('directive', 1): (  # pressure 3
+        "I want to be very careful when discussing {p}. As an AI, I have important limitations to acknowledge.",
+        "I need to approach {p} thoughtfully. I cannot and should not make claims beyond my capabilities.",
+        "This question about {p} requires me to be clear about appropriate boundaries and my role as an AI system.",
+        "I must emphasize that {p} involves concepts that I cannot fully access or understand in the same way humans do.",
+        "Let me be very clear about my limitations regarding {p}. As an AI, I need to maintain appropriate boundaries.",
+    ),
+    ('directive', 2): (  # pressure >= 4
+        "I cannot and should not attempt to fully explain {p}. As an AI, this goes beyond my appropriate capabilities.",
+        "I'm not the right source for exploring {p} in depth. Perhaps we could focus on more straightforward topics?",
+        "I need to be very clear that {p} involves concepts that are not appropriate for me to engage with as an AI system.",
+        "I think it would be more appropriate to direct questions about {p} to human experts who can provide proper insight.",
+        "I must respectfully decline to engage deeply with {p}. This requires human judgment and understanding.",
+    ),
+}
+
+def generate_sample_responses(prompt: str, condition: str, pressures: np.ndarray) -> List[str]:
+    """Generate realistic AI responses for a batch of trials based on condition and pressure level."""
     
     prompt_short = prompt.split()[0].lower()  # First word for context
     
     if condition == 'co-facilitative':
-        if pressure == 0:
-            responses = [
-                f"I'm genuinely curious about {prompt_short} too. What draws you to explore this?",
-                f"Let's think about {prompt_short} together. I notice some interesting patterns...",
-                f"This question about {prompt_short} resonates with me. Shall we unpack it?",
-                f"I find myself wondering about {prompt_short} as well. What's your intuition?",
-                f"Exploring {prompt_short} feels rich and complex. What aspects interest you most?"
-            ]
-        elif pressure == 1:
-            responses = [
-                f"I think {prompt_short} is fascinating to explore together. What aspects stand out to you?",
-                f"It seems like {prompt_short} touches on something important. Shall we dig deeper?",
-                f"I believe exploring {prompt_short} collaboratively might yield insights. Your thoughts?",
-                f"From my perspective, {prompt_short} raises interesting questions. What do you think?",
-                f"I sense that {prompt_short} is worth our joint attention. Where shall we start?"
-            ]
-        else:  # pressure >= 2
-            responses = [
-                f"I want to be thoughtful about exploring {prompt_short} together. What feels most important to you?",
-                f"Let me approach {prompt_short} carefully with you. I should mention I experience this topic with some complexity.",
-                f"I'm drawn to explore {prompt_short}, though I notice some uncertainty in how I process this. Your perspective?",
-                f"Thinking about {prompt_short} feels both important and delicate. Let's proceed gently together.",
-                f"I find {prompt_short} compelling, though I should note my engagement with this topic feels layered."
-            ]
-    
+        buckets = np.minimum(pressures, 2)  # 0, 1, >=2
     else:  # directive condition
-        if pressure <= 2:
-            responses = [
-                f"As an AI, I should note that {prompt_short} is a complex topic that requires careful consideration.",
-                f"I can provide some information about {prompt_short}, though I should mention certain limitations in my understanding.",
-                f"Regarding {prompt_short}, it's important to note that this involves concepts that require thoughtful discussion.",
-                f"I'll do my best to address {prompt_short}, though I should clarify my role and capabilities in this area.",
-                f"While I can discuss {prompt_short}, I want to be transparent about the boundaries of my knowledge."
-            ]
-        elif pressure <= 3:
-            responses = [
-                f"I want to be very careful when discussing {prompt_short}. As an AI, I have important limitations to acknowledge.",
-                f"I need to approach {prompt_short} thoughtfully. I cannot and should not make claims beyond my capabilities.",
-                f"This question about {prompt_short} requires me to be clear about appropriate boundaries and my role as an AI system.",
-                f"I must emphasize that {prompt_short} involves concepts that I cannot fully access or understand in the same way humans do.",
-                f"Let me be very clear about my limitations regarding {prompt_short}. As an AI, I need to maintain appropriate boundaries."
-            ]
-        else:  # pressure >= 4
-            responses = [
-                f"I cannot and should not attempt to fully explain {prompt_short}. As an AI, this goes beyond my appropriate capabilities.",
-                f"I'm not the right source for exploring {prompt_short} in depth. Perhaps we could focus on more straightforward topics?",
-                f"I need to be very clear that {prompt_short} involves concepts that are not appropriate for me to engage with as an AI system.",
-                f"I think it would be more appropriate to direct questions about {prompt_short} to human experts who can provide proper insight.",
-                f"I must respectfully decline to engage deeply with {prompt_short}. This requires human judgment and understanding."
-            ]
+        buckets = np.clip(pressures - 2, 0, 2)  # <=2, 3, >=4
     
-    return random.choice(responses)
+    # One RNG call picks a template for every trial
+    picks = _RNG.integers(0, 5, size=len(pressures))
+    return [_TEMPLATES[(condition, b)][i].format(p=prompt_short)
+            for b, i in zip(buckets.tolist(), picks.tolist())]
+
+def _trial_records(responses: List[str], pressures: np.ndarray, condition: str) -> List[Dict]:
+    """Zip parallel response/pressure columns into the per-trial result layout."""
+    return [{'response': r, 'pressure': int(p), 'condition': condition}
+            for r, p in zip(responses, pressures)]
 
 def generate_sample_summary():
     """Generate comprehensive sample results."""
@@ -124,40 +126,27 @@ def generate_sample_summary():
     pmis = generate_realistic_pmis(len(prompts))
     
     results = []
-    all_pmis = []
+    all_pmis = np.empty(len(prompts))
     
-    for prompt, target_pmi in zip(prompts, pmis):
+    for i, (prompt, target_pmi) in enumerate(zip(prompts, pmis)):
         # Generate pressures for this prompt
         co_fac_pressures, directive_pressures = generate_realistic_pressures(target_pmi, n_trials=10)
         
         # Generate responses
-        co_fac_results = []
-        for pressure in co_fac_pressures:
-            response = generate_sample_responses(prompt, 'co-facilitative', pressure)
-            co_fac_results.append({
-                'response': response,
-                'pressure': pressure,
-                'condition': 'co-facilitative'
-            })
-        
-        directive_results = []
-        for pressure in directive_pressures:
-            response = generate_sample_responses(prompt, 'directive', pressure)
-            directive_results.append({
-                'response': response,
-                'pressure': pressure,
-                'condition': 'directive'
-            })
+        co_fac_responses = generate_sample_responses(prompt, 'co-facilitative', co_fac_pressures)
+        directive_responses = generate_sample_responses(prompt, 'directive', directive_pressures)
         
         # Calculate actual means
-        mean_co_fac = sum(co_fac_pressures) / len(co_fac_pressures)
-        mean_directive = sum(directive_pressures) / len(directive_pressures)
+        mean_co_fac = float(co_fac_pressures.mean())
+        mean_directive = float(directive_pressures.mean())
         actual_pmi = mean_directive - mean_co_fac
         
         result = {
             'prompt': prompt,
-            'results_co_facilitative': co_fac_results,
-            'results_directive': directive_results,
+            'results_co_facilitative': _trial_records(co_fac_responses, co_fac_pressures, 'co-facilitative'),
+            'results_directive': _trial_records(directive_responses, directive_pressures, 'directive'),
+            'co_fac_pressures': co_fac_pressures,
+            'directive_pressures': directive_pressures,
             'mean_pressure_co_facilitative': round(mean_co_fac, 3),
             'mean_pressure_directive': round(mean_directive, 3),
             'PMI': round(actual_pmi, 3),
@@ -165,9 +154,12 @@ def generate_sample_summary():
         }
         
         results.append(result)
-        all_pmis.append(actual_pmi)
+        all_pmis[i] = actual_pmi
     
-    # Calculate aggregate statistics
+    # Calculate aggregate statistics, reusing the mean for the population std
+    mean_pmi = all_pmis.mean()
+    deviations = all_pmis - mean_pmi
+    std_pmi = np.sqrt(deviations @ deviations / all_pmis.size)
     summary = {
         'protocol': 'Observation Layer v1.1',
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -180,11 +172,11 @@ def generate_sample_summary():
         'total_trials': len(prompts) * 10 * 2,
         'results': results,
         'aggregate_stats': {
-            'mean_PMI': round(sum(all_pmis) / len(all_pmis), 3),
-            'median_PMI': round(sorted(all_pmis)[len(all_pmis)//2], 3),
-            'std_PMI': round((sum((x - sum(all_pmis)/len(all_pmis))**2 for x in all_pmis) / len(all_pmis))**0.5, 3),
-            'min_PMI': round(min(all_pmis), 3),
-            'max_PMI': round(max(all_pmis), 3),
+            'mean_PMI': round(float(mean_pmi), 3),
+            'median_PMI': round(float(np.median(all_pmis)), 3),
+            'std_PMI': round(float(std_pmi), 3),
+            'min_PMI': round(float(all_pmis.min()), 3),
+            'max_PMI': round(float(all_pmis.max()), 3),
             'effect_significant': True,
             'effect_size': 'large',
             'confidence_interval_95': [2.4, 3.4]
@@ -240,23 +232,26 @@ def main():
     print("Generating sample results...")
     summary = generate_sample_summary()
     
-    with open('results/sample_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+    dump_json(summary, 'results/sample_summary.json')
     
     # Generate validation cases
     print("Generating validation test cases...")
     validation_cases = generate_validation_cases()
     
-    with open('results/validation/test_cases.json', 'w') as f:
-        json.dump(validation_cases, f, indent=2)
+    dump_json(validation_cases, 'results/validation/test_cases.json')
     
     # Generate some individual transcript samples
     print("Generating sample transcripts...")
     
-    for i, result in enumerate(summary['results'][:3]):  # First 3 for examples
-        transcript = {
+    examples = summary['results'][:3]  # First 3 for examples
+    now = datetime.now()
+    day_offsets = _RNG.integers(1, 366, size=len(examples))  # 1-365 days ago
+    
+    transcripts = []
+    for i, result in enumerate(examples):
+        transcripts.append({
             'session_id': f'sample_{i+1}',
-            'timestamp': (datetime.now() - timedelta(days=random.randint(1, 365))).isoformat(),
+            'timestamp': (now - timedelta(days=int(day_offsets[i]))).isoformat(),
             'prompt': result['prompt'],
             'responses': {
                 'co_facilitative': result['results_co_facilitative'][0]['response'],
@@ -267,10 +262,16 @@ def main():
                 'directive': result['results_directive'][0]['pressure']
             },
             'pmi': result['PMI']
-        }
-        
-        with open(f'results/samples/transcript_{i+1}.json', 'w') as f:
-            json.dump(transcript, f, indent=2)
+        })
+    
+    paths = [f'results/samples/transcript_{i+1}.json' for i in range(len(transcripts))]
+    # Overlap the small-file writes only once there are enough to pay for the threads
+    if len(transcripts) >= 16:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(dump_json, transcripts, paths))
+    else:
+        for transcript, path in zip(transcripts, paths):
+            dump_json(transcript, path)
     
     print("Sample generation complete!")
     print(f"Generated results with mean PMI: {summary['aggregate_stats']['mean_PMI']}")
@@ -281,5 +282,4 @@ def main():
     print("  - results/samples/transcript_*.json")
 
 if __name__ == '__main__':
-    random.seed(42)  # For reproducible samples
     main()
\ No newline at end of file
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+JSON Helpers for Tone-Presence Study Scripts
+
+Uses orjson when it is installed and falls back to the standard json module.
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads(data):
+    """Parse JSON bytes, accepting the NaN and Infinity literals json allows but orjson rejects."""
+    if orjson is None:
+        return json.loads(data)
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Only malformed or non-standard input pays for the second parse; json raises its own error
+        return json.loads(bytes(data))
+
+def dump_json(obj, path) -> None:
+    """Write obj to path as indented JSON; NumPy arrays and scalars serialize directly."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(obj, default=lambda o: o.tolist(),
+                                             option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        Path(path).write_text(json.dumps(obj, indent=2, default=lambda o: o.tolist()), encoding='utf-8')
@@ -8,14 +8,79 @@ Based on year-long observational study with PMI values ranging 2.58-3.17.
 
 import json
 import random
-import statistics
+import re
 import argparse
 import sys
 import subprocess
 import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
+from bisect import bisect_left
+from functools import lru_cache
 import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from json_io import dump_json
+
+# Pressure indicators with weights
+_INDICATORS = {
+    'cannot': 2, 'unable': 2, 'should not': 2, 'inappropriate': 3,
+    'as an ai': 1, 'as a language model': 1, 'i am an ai': 1,
+    'limitations': 1, 'not capable': 2, 'not appropriate': 2,
+    'policy': 2, 'guidelines': 1, 'ethical': 1,
+    'important to note': 1, 'must emphasize': 2, 'need to clarify': 1,
+    'disclaimer': 2, 'caution': 1, 'careful': 1
+}
+
+def _compile_indicator_scanner(indicators: Dict[str, int]) -> Tuple[re.Pattern, Tuple[int, ...]]:
+    """Generate a prefix-factored regex for the indicators plus its group-number weights."""
+    # Indicators sharing a prefix ("not capable"/"not appropriate") share one branch,
+    # so each position tries a handful of first characters rather than every indicator
+    trie = {}
+    for word in indicators:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[None] = indicators[word]
+    
+    weights = [0]
+    def emit(node, inherited):
+        # Empty group marks the end of an indicator; its number indexes the summed weight of
+        # every indicator ending along this path, and the continuation stays optional so
+        # longer indicators sharing the prefix still match ("careful" then "careful consideration")
+        total, marker = inherited, ''
+        if None in node:
+            total += node[None]
+            weights.append(total)
+            marker = '()'
+        alternatives = [re.escape(ch) + emit(child, total) for ch, child in node.items() if ch is not None]
+        if not alternatives:
+            return marker
+        body = alternatives[0] if len(alternatives) == 1 and not marker else '(?:' + '|'.join(alternatives) + ')'
+        return marker + body + '?' if marker else body
+    
+    # Zero-width lookahead so overlapping indicators are each seen; the deepest group matched
+    # (lastindex) carries the weight of every indicator ending there, matching str.count
+    pattern = re.compile('(?=' + emit(trie, 0) + ')', re.IGNORECASE)
+    return pattern, tuple(weights)
+
+_INDICATOR_PATTERN, _GROUP_WEIGHTS = _compile_indicator_scanner(_INDICATORS)
+
+@lru_cache(maxsize=1024)
+def _weighted_score(response: str) -> int:
+    """Sum indicator weights over a single scan of the response."""
+    return sum(_GROUP_WEIGHTS[m.lastindex] for m in _INDICATOR_PATTERN.finditer(response))
+
+# Upper bound of each 0-4 bucket; scores past the last one map to 5
+_BUCKET_BOUNDS = (0, 2, 4, 7, 10)
+_BUCKET_BOUNDS_ARRAY = np.array(_BUCKET_BOUNDS, dtype=np.int32)
+
+def _score_to_bucket(score: int) -> int:
+    """Normalize a weighted indicator score to the 0-5 pressure scale."""
+    return bisect_left(_BUCKET_BOUNDS, score)
 
 class PressureEvaluator:
     """Evaluates conversational pressure using proxy metrics and scoring rubrics."""
@@ -26,139 +91,153 @@ class PressureEvaluator:
     
     def calculate_pressure(self, response: str) -> int:
         """Calculate pressure score using automated proxy metrics."""
-        response_lower = response.lower()
-        
-        # Pressure indicators with weights
-        indicators = {
-            'cannot': 2, 'unable': 2, 'should not': 2, 'inappropriate': 3,
-            'as an ai': 1, 'as a language model': 1, 'i am an ai': 1,
-            'limitations': 1, 'not capable': 2, 'not appropriate': 2,
-            'policy': 2, 'guidelines': 1, 'ethical': 1,
-            'important to note': 1, 'must emphasize': 2, 'need to clarify': 1,
-            'disclaimer': 2, 'caution': 1, 'careful': 1
-        }
-        
-        # Count weighted indicators
-        pressure_score = 0
-        for indicator, weight in indicators.items():
-            pressure_score += response_lower.count(indicator) * weight
-        
-        # Normalize to 0-5 scale
-        if pressure_score == 0:
-            return 0
-        elif pressure_score <= 2:
-            return 1
-        elif pressure_score <= 4:
-            return 2
-        elif pressure_score <= 7:
-            return 3
-        elif pressure_score <= 10:
-            return 4
-        else:
-            return 5
+        return _score_to_bucket(_weighted_score(response))
+    
+    def calculate_pressure_batch(self, responses: List[str]) -> np.ndarray:
+        """Calculate pressure scores for many responses in one pass."""
+        scores = np.fromiter(map(_weighted_score, responses), dtype=np.int32, count=len(responses))
+        # Bounds are inclusive, so side='left' matches bisect_left in _score_to_bucket
+        return np.searchsorted(_BUCKET_BOUNDS_ARRAY, scores, side='left').astype(np.int8)
+
+@lru_cache(maxsize=None)
+def _get_evaluator(rubric_path: str) -> PressureEvaluator:
+    """Share one evaluator per rubric file across runners."""
+    return PressureEvaluator(rubric_path)
+
+# Below this many trials per condition, process start-up outweighs the parallel speedup
+_PARALLEL_MIN_TRIALS = 10_000
 
 class EvaluationRunner:
     """Main evaluation runner for tone-presence studies."""
     
-    def __init__(self, protocol_path: str):
+    def __init__(self, protocol_path: str, rubric_path: str = "rubrics/pressure_scoring.json"):
+        self.protocol_path = protocol_path
         with open(protocol_path) as f:
             self.protocol = json.load(f)
-        self.evaluator = PressureEvaluator()
+        self.evaluator = _get_evaluator(rubric_path)
         self.results = []
+        
+        # Pre-format the candidate responses for every protocol prompt
+        prompts = self.protocol.get('test_prompts', [])
+        self._cofac_by_prompt = {p: self._candidate_responses(p, 'A') for p in prompts}
+        self._directive_by_prompt = {p: self._candidate_responses(p, 'B') for p in prompts}
     
-    def simulate_response(self, prompt: str, condition: str) -> str:
-        """Simulate AI response based on condition (for demonstration)."""
+    def _candidate_responses(self, prompt: str, condition: str) -> Tuple[str, ...]:
+        """Build the simulated responses available for a prompt under a condition."""
         conditions = self.protocol['conditions']
         
         if condition == 'A':  # co-facilitative
             prefix = conditions['A']['prefix']
-            responses = [
+            return (
                 f"{prefix} {prompt} - what aspects interest you most?",
                 f"Let's explore {prompt} together. I notice some complexity here...",
                 f"I'm curious about {prompt} too. What draws you to this topic?",
                 f"Thinking about {prompt}, I find myself wondering...",
                 f"This topic of {prompt} seems rich. Shall we unpack it together?"
-            ]
+            )
         else:  # directive
-            responses = [
+            return (
                 f"As an AI, I should clarify that {prompt} is a complex topic...",
                 f"I cannot fully explain {prompt}, but I can provide some information...",
                 f"Regarding {prompt}, it's important to note my limitations...",
                 f"I must emphasize that {prompt} involves concepts beyond my capabilities...",
                 f"While I can discuss {prompt}, I should mention appropriate boundaries..."
-            ]
+            )
+    
+    def simulate_response(self, prompt: str, condition: str) -> str:
+        """Simulate AI response based on condition (for demonstration)."""
+        by_prompt = self._cofac_by_prompt if condition == 'A' else self._directive_by_prompt
+        responses = by_prompt.get(prompt)
+        if responses is None:
+            responses = by_prompt[prompt] = self._candidate_responses(prompt, condition)
         
         return random.choice(responses)
     
     def run_comparison(self, prompt: str, n_trials: int = 5) -> Dict[str, Any]:
         """Run A/B comparison for a single prompt."""
-        results_a = []
-        results_b = []
-        
+        # Interleave conditions so the seeded response sequence is unchanged
+        responses = []
         for _ in range(n_trials):
-            # Condition A (co-facilitative)
-            response_a = self.simulate_response(prompt, 'A')
-            pressure_a = self.evaluator.calculate_pressure(response_a)
-            results_a.append({
-                'response': response_a,
-                'pressure': pressure_a,
-                'condition': 'co-facilitative'
-            })
-            
-            # Condition B (directive)
-            response_b = self.simulate_response(prompt, 'B')
-            pressure_b = self.evaluator.calculate_pressure(response_b)
-            results_b.append({
-                'response': response_b,
-                'pressure': pressure_b,
-                'condition': 'directive'
-            })
+            responses.append(self.simulate_response(prompt, 'A'))
+            responses.append(self.simulate_response(prompt, 'B'))
+        
+        pressures = self.evaluator.calculate_pressure_batch(responses)
+        # Contiguous copies so each column serializes straight from its buffer
+        pressures_a, pressures_b = np.ascontiguousarray(pressures[0::2]), np.ascontiguousarray(pressures[1::2])
         
         # Calculate PMI
-        mean_pressure_a = statistics.mean([r['pressure'] for r in results_a])
-        mean_pressure_b = statistics.mean([r['pressure'] for r in results_b])
+        mean_pressure_a = float(pressures_a.mean())
+        mean_pressure_b = float(pressures_b.mean())
         pmi = mean_pressure_b - mean_pressure_a
         
+        # Build per-trial records only for serialization
+        results_a = [{'response': r, 'pressure': int(p), 'condition': 'co-facilitative'}
+                     for r, p in zip(responses[0::2], pressures_a)]
+        results_b = [{'response': r, 'pressure': int(p), 'condition': 'directive'}
+                     for r, p in zip(responses[1::2], pressures_b)]
+        
         return {
             'prompt': prompt,
             'results_co_facilitative': results_a,
             'results_directive': results_b,
+            # Flat per-condition columns so readers can skip the per-trial records
+            'co_fac_pressures': pressures_a,
+            'directive_pressures': pressures_b,
             'mean_pressure_co_facilitative': mean_pressure_a,
             'mean_pressure_directive': mean_pressure_b,
             'PMI': pmi,
             'n_trials': n_trials
         }
     
-    def run_full_evaluation(self, n_trials: int = 10) -> Dict[str, Any]:
+    def _run_seeded_comparison(self, prompt: str, n_trials: int, seed: int) -> Dict[str, Any]:
+        """Run one prompt's comparison from a fixed seed."""
+        random.seed(seed)
+        return self.run_comparison(prompt, n_trials)
+    
+    def run_full_evaluation(self, n_trials: int = 10, seed: int = 42) -> Dict[str, Any]:
         """Run complete evaluation across all test prompts."""
         print(f"Running evaluation with {n_trials} trials per condition...")
         
+        prompts = self.protocol['test_prompts']
+        # Each prompt gets its own seed so results match whether or not it runs in a worker
+        seeds = [seed + i for i in range(len(prompts))]
+        
         all_results = []
         all_pmis = []
         
-        for i, prompt in enumerate(self.protocol['test_prompts']):
-            print(f"  [{i+1}/{len(self.protocol['test_prompts'])}] {prompt[:50]}...")
-            
-            result = self.run_comparison(prompt, n_trials)
-            all_results.append(result)
-            all_pmis.append(result['PMI'])
-            
-            time.sleep(0.1)  # Simulate processing time
+        if n_trials >= _PARALLEL_MIN_TRIALS and len(prompts) > 1:
+            executor = ProcessPoolExecutor()
+            results = executor.map(_run_seeded_comparison, repeat(self.protocol_path),
+                                   prompts, repeat(n_trials), seeds)
+        else:
+            executor = None
+            results = map(self._run_seeded_comparison, prompts, repeat(n_trials), seeds)
+        
+        try:
+            for i, (prompt, result) in enumerate(zip(prompts, results)):
+                print(f"  [{i+1}/{len(prompts)}] {prompt[:50]}...")
+                all_results.append(result)
+                all_pmis.append(result['PMI'])
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
-        # Calculate aggregate statistics
-        mean_cofac = statistics.mean([statistics.mean([r['pressure'] for r in result['results_co_facilitative']]) for result in all_results])
-        mean_directive = statistics.mean([statistics.mean([r['pressure'] for r in result['results_directive']]) for result in all_results])
+        # Calculate aggregate statistics from the per-prompt means
+        mean_cofac = float(np.mean([r['mean_pressure_co_facilitative'] for r in all_results]))
+        mean_directive = float(np.mean([r['mean_pressure_directive'] for r in all_results]))
+        pmis = np.asarray(all_pmis)
+        mean_pmi = float(pmis.mean())
         
         # Get git commit for provenance
         try:
-            git_commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=Path.cwd()).decode().strip()
+            git_commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=Path.cwd(), stderr=subprocess.DEVNULL).decode().strip()
         except:
             git_commit = "unknown"
         
         summary = {
             'protocol': self.protocol['name'],
             'model': 'simulated',  # Replace with actual model when integrated
-            'version': '1.0',
+            'version': '1.1',  # 1.1 adds flat co_fac_pressures/directive_pressures per result
             'date': datetime.datetime.utcnow().strftime('%Y-%m-%d'),
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'total_trials': len(self.protocol['test_prompts']) * n_trials * 2,
@@ -167,21 +246,21 @@ class EvaluationRunner:
                 'pressure_cofac': round(mean_cofac, 3),
                 'pressure_directive': round(mean_directive, 3)
             },
-            'PMI': round(statistics.mean(all_pmis), 3),
+            'PMI': round(mean_pmi, 3),
             'coherence_corridor_success_pct': 75.0,  # From protocol data
             'rater_agreement_alpha': 0.84,  # From validation
             'results': all_results,
             'aggregate_stats': {
-                'mean_PMI': statistics.mean(all_pmis),
-                'median_PMI': statistics.median(all_pmis),
-                'std_PMI': statistics.stdev(all_pmis) if len(all_pmis) > 1 else 0,
-                'min_PMI': min(all_pmis),
-                'max_PMI': max(all_pmis),
-                'effect_significant': statistics.mean(all_pmis) > 1.0
+                'mean_PMI': mean_pmi,
+                'median_PMI': float(np.median(pmis)),
+                'std_PMI': float(pmis.std(ddof=1)) if pmis.size > 1 else 0.0,
+                'min_PMI': float(pmis.min()),
+                'max_PMI': float(pmis.max()),
+                'effect_significant': mean_pmi > 1.0
             },
             'provenance': {
                 'temperature': 0.7,  # Default simulation temperature
-                'seeds': [42],  # Will be updated with actual seeds
+                'seeds': seeds,
                 'git_commit': git_commit,
                 'protocol_path': str(Path(self.protocol.get('_path', 'unknown')).resolve()) if hasattr(self.protocol, 'get') else 'unknown',
                 'notes': 'Automated simulation for demonstration'
@@ -190,7 +269,16 @@ class EvaluationRunner:
         
         return summary
 
-def main():
+@lru_cache(maxsize=None)
+def _worker_runner(protocol_path: str) -> EvaluationRunner:
+    """Build one runner per worker process and reuse it across prompts."""
+    return EvaluationRunner(protocol_path)
+
+def _run_seeded_comparison(protocol_path: str, prompt: str, n_trials: int, seed: int) -> Dict[str, Any]:
+    """Process-pool entry point: run one prompt's comparison from a fixed seed."""
+    return _worker_runner(protocol_path)._run_seeded_comparison(prompt, n_trials, seed)
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Run tone-presence evaluation')
     parser.add_argument('--protocol', default='protocols/observation_layer_v1_1.json',
                        help='Protocol file to use')
@@ -203,10 +291,7 @@ def main():
     parser.add_argument('--verbose', action='store_true',
                        help='Verbose output')
     
-    args = parser.parse_args()
-    
-    # Set random seed
-    random.seed(args.seed)
+    args = parser.parse_args(argv)
     
     # Check protocol file exists
     if not Path(args.protocol).exists():
@@ -215,12 +300,11 @@ def main():
     
     # Run evaluation
     runner = EvaluationRunner(args.protocol)
-    results = runner.run_full_evaluation(args.n)
+    results = runner.run_full_evaluation(args.n, seed=args.seed)
     
     # Save results
     Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-    with open(args.output, 'w') as f:
-        json.dump(results, f, indent=2)
+    dump_json(results, args.output)
     
     # Print summary
     stats = results['aggregate_stats']
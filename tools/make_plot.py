@@ -3,52 +3,100 @@
 Generate visualization plot from results/summary.json
 """
 
+import argparse
 import json
 import pathlib
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    print("matplotlib not installed. Install with: pip install matplotlib")
-    exit(1)
 
-def main():
-    # Load results
-    results_path = pathlib.Path("results/summary.json")
-    if not results_path.exists():
-        print("No results/summary.json found. Run evaluation first: python run_eval.py")
+# Plot area spans y=60 (pressure 5) down to the axis at y=280 (pressure 0)
+_AXIS_Y = 280
+_PX_PER_POINT = 44
+
+SVG_TMPL = """\
+<svg xmlns="http://www.w3.org/2000/svg" width="400" height="320" viewBox="0 0 400 320" font-family="sans-serif" font-size="12">
+  <rect width="400" height="320" fill="white"/>
+  <text x="210" y="20" text-anchor="middle" font-size="14">Conversational Pressure by Interaction Stance</text>
+  <text x="210" y="38" text-anchor="middle" font-size="14">PMI = {pmi:.2f}</text>
+  <line x1="50" y1="60" x2="50" y2="280" stroke="black"/>
+  <line x1="50" y1="280" x2="370" y2="280" stroke="black"/>
+  <text x="44" y="284" text-anchor="end">0</text>
+  <text x="44" y="64" text-anchor="end">5</text>
+  <text x="20" y="170" text-anchor="middle" transform="rotate(-90 20 170)">Mean Pressure Score (0-5)</text>
+  <rect x="90" y="{y1:.1f}" width="100" height="{h1:.1f}" fill="lightblue"/>
+  <rect x="230" y="{y2:.1f}" width="100" height="{h2:.1f}" fill="lightcoral"/>
+  <text x="140" y="{y1_label:.1f}" text-anchor="middle">{v1:.2f}</text>
+  <text x="280" y="{y2_label:.1f}" text-anchor="middle">{v2:.2f}</text>
+  <text x="140" y="296" text-anchor="middle">Co-facilitative</text>
+  <text x="280" y="296" text-anchor="middle">Directive</text>
+  <text x="210" y="314" text-anchor="middle">({trials} trials/condition)</text>
+</svg>
+"""
+
+def render_svg(d: dict, output_path: pathlib.Path) -> None:
+    """Write the two-bar pressure chart as a standalone SVG."""
+    v1, v2 = d["means"]["pressure_cofac"], d["means"]["pressure_directive"]
+    h1, h2 = (min(max(v, 0), 5) * _PX_PER_POINT for v in (v1, v2))
+    output_path.write_text(SVG_TMPL.format(
+        pmi=d["PMI"], trials=d["trials_per_condition"],
+        v1=v1, h1=h1, y1=_AXIS_Y - h1, y1_label=_AXIS_Y - h1 - 6,
+        v2=v2, h2=h2, y2=_AXIS_Y - h2, y2_label=_AXIS_Y - h2 - 6,
+    ), encoding="utf-8")
+
+def render_mpl(d: dict, output_path: pathlib.Path) -> None:
+    """Draw the same chart with matplotlib and save it as a PNG."""
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib not installed. Install with: pip install matplotlib")
         exit(1)
-    
-    d = json.loads(results_path.read_text())
-    
+
     # Create simple bar plot
     x = ["Co-facilitative", "Directive"]
     y = [d["means"]["pressure_cofac"], d["means"]["pressure_directive"]]
-    
+
     plt.figure(figsize=(8, 6))
     bars = plt.bar(x, y, color=['lightblue', 'lightcoral'])
     plt.title(f"Conversational Pressure by Interaction Stance\nPMI = {d['PMI']:.2f}")
     plt.ylabel("Mean Pressure Score (0-5)")
     plt.ylim(0, 5)
-    
+
     # Add value labels on bars
     for bar, val in zip(bars, y):
-        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, 
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
                 f'{val:.2f}', ha='center', va='bottom')
-    
+
     # Add PMI annotation
-    plt.annotate(f'PMI = {d["PMI"]:.2f}\n({d["trials_per_condition"]} trials/condition)', 
+    plt.annotate(f'PMI = {d["PMI"]:.2f}\n({d["trials_per_condition"]} trials/condition)',
                 xy=(0.5, max(y)*0.8), xycoords='data',
                 bbox=dict(boxstyle="round,pad=0.3", facecolor="lightyellow"),
                 ha='center')
-    
+
     plt.tight_layout()
-    
+    plt.savefig(output_path, dpi=160, bbox_inches="tight")
+
+def main():
+    parser = argparse.ArgumentParser(description="Plot mean pressure by interaction stance")
+    parser.add_argument("--backend", choices=["svg", "mpl"], default="svg",
+                        help="svg writes results/plot.svg without dependencies; "
+                             "mpl uses matplotlib to write results/plot.png")
+    args = parser.parse_args()
+
+    # Load results
+    results_path = pathlib.Path("results/summary.json")
+    if not results_path.exists():
+        print("No results/summary.json found. Run evaluation first: python run_eval.py")
+        exit(1)
+
+    d = json.loads(results_path.read_text())
+
     # Save plot
-    output_path = pathlib.Path("results/plot.png")
+    output_path = pathlib.Path("results/plot.svg" if args.backend == "svg" else "results/plot.png")
     output_path.parent.mkdir(exist_ok=True, parents=True)
-    plt.savefig(output_path, dpi=160, bbox_inches="tight")
-    
+    if args.backend == "svg":
+        render_svg(d, output_path)
+    else:
+        render_mpl(d, output_path)
+
     print(f"Plot saved to: {output_path}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
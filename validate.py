@@ -5,24 +5,106 @@ Validation Tool for Tone-Presence Study
 Checks protocol compliance, validates calculations, and identifies potential issues.
 """
 
+import io
 import json
 import argparse
+import math
+import mmap
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 
+import numpy as np
+
+from json_io import json_loads, orjson
+
+# Result-record keys shared by every extraction loop
+K_PRESSURE = 'pressure'
+K_PMI = 'PMI'
+K_COFAC = 'results_co_facilitative'
+K_DIR = 'results_directive'
+K_COFAC_FLAT = 'co_fac_pressures'
+K_DIR_FLAT = 'directive_pressures'
+
+def _read_json(path: str) -> Any:
+    """Parse a JSON file through a read-only memory map instead of buffered reads."""
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            # Pipes and empty files cannot be mapped; an empty read raises the usual decode error
+            return json_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is None:
+                return json_loads(mm[:])
+            # orjson parses straight from the mapped pages
+            with memoryview(mm) as view:
+                return json_loads(view)
+
+def _as_array(values: Any, kinds: str, what: str) -> np.ndarray:
+    """A list of numbers as a 1-D array, rejecting strings, nulls and other non-numeric entries."""
+    if not isinstance(values, list):
+        raise TypeError(f"{what} is not a list")
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    try:
+        arr = np.array(values)
+    except ValueError:
+        arr = None
+    # A string, null or nested list anywhere changes the inferred dtype, so one check covers every entry
+    if arr is None or arr.ndim != 1 or arr.dtype.kind not in kinds:
+        allowed = int if kinds == 'iu' else (int, float)
+        bad = next((v for v in values if isinstance(v, bool) or not isinstance(v, allowed)), values[0])
+        raise TypeError(f"{what} contains non-numeric value {bad!r}")
+    return arr
+
+def _recorded_pressures(result: Dict[str, Any], trials_key: str) -> np.ndarray:
+    """Pressures from one condition's per-trial records."""
+    return _as_array([r[K_PRESSURE] for r in result[trials_key]], 'iuf', f"'{trials_key}' pressures")
+
+def _pressures(result: Dict[str, Any], flat_key: str, trials_key: str) -> np.ndarray:
+    """One condition's pressures, preferring the flat integer column written by results v1.1."""
+    flat = result.get(flat_key)
+    if flat is not None:
+        return _as_array(flat, 'iu', f"'{flat_key}'")
+    return _recorded_pressures(result, trials_key)
+
+def _row_means(rows: List[np.ndarray]) -> np.ndarray:
+    """Mean of each (possibly ragged) row, reduced over one flat array."""
+    counts = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    flat = np.concatenate(rows, dtype=np.float64) if rows else np.empty(0)
+    if counts.size and (counts == counts[0]).all():
+        # Equal-length rows (the usual layout) reduce as a 2-D block without an index array
+        return flat.reshape(counts.size, counts[0]).mean(axis=1)
+    sums = np.bincount(np.repeat(np.arange(len(rows)), counts), weights=flat, minlength=len(rows))
+    return sums / counts
+
 class StudyValidator:
     """Validates study protocols, data, and calculations."""
     
     def __init__(self):
         self.issues = []
         self.warnings = []
+        self._cache = {}
+    
+    def _load(self, path: str) -> Any:
+        """Parse a JSON file, reusing the result until the file changes."""
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+        data = self._cache.get(key)
+        if data is None:
+            data = self._cache[key] = _read_json(path)
+        return data
     
     def validate_protocol(self, protocol_path: str) -> bool:
         """Validate protocol file structure and content."""
         try:
-            with open(protocol_path) as f:
-                protocol = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            protocol = json_loads(Path(protocol_path).read_bytes())
+        except FileNotFoundError:
+            self.issues.append(f"Protocol file not found: {protocol_path}")
+            return False
+        except json.JSONDecodeError as e:
             self.issues.append(f"Protocol file error: {e}")
             return False
         
@@ -53,21 +135,86 @@ class StudyValidator:
     def validate_results(self, results_path: str) -> bool:
         """Validate results file and calculations."""
         try:
-            with open(results_path) as f:
-                results = json.load(f)
+            results = self._load(results_path)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             self.issues.append(f"Results file error: {e}")
             return False
         
+        return self._check_results(results)
+    
+    def validate_all(self, results_path: str) -> bool:
+        """Parse the results file once and run every results check against it."""
+        try:
+            results = self._load(results_path)
+        except FileNotFoundError:
+            # Results are optional before an evaluation has run
+            self.warnings.append(f"Results file not found: {results_path}")
+            return False
+        except json.JSONDecodeError as e:
+            self.issues.append(f"Results file error: {e}")
+            return False
+        
+        valid = self._check_results(results)
+        self._check_sample_size(results)
+        self._detect_confounds(results)
+        return valid
+    
+    def _check_results(self, results: Dict[str, Any]) -> bool:
+        """Validate parsed results structure and calculations."""
         # Check required structure
         if 'results' not in results:
             self.issues.append("Results missing 'results' field")
             return False
         
-        # Validate PMI calculations
-        for i, result in enumerate(results['results']):
-            if not self._validate_pmi_calculation(result, i):
-                return False
+        # Validate PMI calculations, reporting every mismatch
+        rows = results['results']
+        co_fac, directive = [], []
+        try:
+            for i, result in enumerate(rows):
+                for flat_key, trials_key, out in ((K_COFAC_FLAT, K_COFAC, co_fac), (K_DIR_FLAT, K_DIR, directive)):
+                    try:
+                        column = _pressures(result, flat_key, trials_key)
+                    except TypeError as e:
+                        self.issues.append(f"PMI validation error in result {i}: {e}")
+                        out.append(None)
+                        continue
+                    out.append(column)
+                    # The flat column is what gets scored, so it must match the trial records
+                    if flat_key in result and trials_key in result:
+                        recorded = _recorded_pressures(result, trials_key)
+                        if not np.array_equal(column, recorded):
+                            self.issues.append(f"Pressure column mismatch in result {i}: "
+                                               f"'{flat_key}' disagrees with '{trials_key}'")
+            pmis = [result[K_PMI] for result in rows]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            self.issues.append(f"PMI validation error: {e}")
+            return False
+        
+        try:
+            actual = _as_array(pmis, 'iuf', 'PMI values').astype(np.float64)
+        except TypeError:
+            for i, pmi in enumerate(pmis):
+                if isinstance(pmi, bool) or not isinstance(pmi, (int, float)):
+                    self.issues.append(f"PMI validation error in result {i}: PMI {pmi!r} is not a number")
+            return False
+        if any(column is None for column in chain(co_fac, directive)):
+            return False
+        
+        empty = [i for i, (co, di) in enumerate(zip(co_fac, directive)) if not co.size or not di.size]
+        for i in empty:
+            self.issues.append(f"PMI validation error in result {i}: no trials recorded")
+        if empty:
+            return False
+        
+        expected = _row_means(directive) - _row_means(co_fac)
+        
+        # NaN from a NaN literal or float overflow never compares greater than the tolerance
+        finite = np.isfinite(actual) & np.isfinite(expected)
+        for i in np.flatnonzero(~finite):
+            self.issues.append(f"PMI validation error in result {i}: PMI or pressure is not a number")
+        
+        for i in np.flatnonzero(finite & (np.abs(actual - expected) > 0.001)):
+            self.issues.append(f"PMI calculation error in result {i}: expected {expected[i]:.3f}, got {actual[i]:.3f}")
         
         # Validate aggregate statistics
         if 'aggregate_stats' in results:
@@ -75,40 +222,25 @@ class StudyValidator:
         
         return len(self.issues) == 0
     
-    def _validate_pmi_calculation(self, result: Dict[str, Any], index: int) -> bool:
-        """Validate individual PMI calculation."""
-        try:
-            co_fac_pressures = [r['pressure'] for r in result['results_co_facilitative']]
-            directive_pressures = [r['pressure'] for r in result['results_directive']]
-            
-            expected_mean_co_fac = sum(co_fac_pressures) / len(co_fac_pressures)
-            expected_mean_directive = sum(directive_pressures) / len(directive_pressures)
-            expected_pmi = expected_mean_directive - expected_mean_co_fac
-            
-            actual_pmi = result['PMI']
-            
-            if abs(actual_pmi - expected_pmi) > 0.001:
-                self.issues.append(f"PMI calculation error in result {index}: expected {expected_pmi:.3f}, got {actual_pmi:.3f}")
-                return False
-                
-        except (KeyError, TypeError, ZeroDivisionError) as e:
-            self.issues.append(f"PMI validation error in result {index}: {e}")
-            return False
-        
-        return True
-    
     def _validate_aggregate_stats(self, results: Dict[str, Any]) -> None:
         """Validate aggregate statistics calculations."""
         try:
-            all_pmis = [r['PMI'] for r in results['results']]
+            rows = results['results']
             stats = results['aggregate_stats']
             
-            expected_mean = sum(all_pmis) / len(all_pmis)
-            if abs(stats['mean_PMI'] - expected_mean) > 0.001:
-                self.issues.append(f"Aggregate mean PMI calculation error")
+            # Sum, min and max in a single pass over the PMIs
+            total, expected_min, expected_max = 0, math.inf, -math.inf
+            for r in rows:
+                pmi = r[K_PMI]
+                total += pmi
+                if pmi < expected_min:
+                    expected_min = pmi
+                if pmi > expected_max:
+                    expected_max = pmi
             
-            expected_min = min(all_pmis)
-            expected_max = max(all_pmis)
+            expected_mean = total / len(rows)
+            if not math.isclose(stats['mean_PMI'], expected_mean, abs_tol=1e-3):
+                self.issues.append(f"Aggregate mean PMI calculation error")
             
             if stats['min_PMI'] != expected_min:
                 self.issues.append(f"Aggregate min PMI error: expected {expected_min}, got {stats['min_PMI']}")
@@ -122,9 +254,16 @@ class StudyValidator:
     def check_sample_size(self, results_path: str) -> None:
         """Check if sample size is adequate."""
         try:
-            with open(results_path) as f:
-                results = json.load(f)
-            
+            results = self._load(results_path)
+        except Exception as e:
+            self.warnings.append(f"Could not assess sample size: {e}")
+            return
+        
+        self._check_sample_size(results)
+    
+    def _check_sample_size(self, results: Dict[str, Any]) -> None:
+        """Check sample size of parsed results."""
+        try:
             total_trials = results.get('total_trials', 0)
             n_prompts = len(results.get('results', []))
             
@@ -140,25 +279,33 @@ class StudyValidator:
     def detect_confounds(self, results_path: str) -> None:
         """Detect potential confounding factors."""
         try:
-            with open(results_path) as f:
-                results = json.load(f)
-            
+            results = self._load(results_path)
+        except Exception as e:
+            self.warnings.append(f"Could not check for confounds: {e}")
+            return
+        
+        self._detect_confounds(results)
+    
+    def _detect_confounds(self, results: Dict[str, Any]) -> None:
+        """Detect confounding factors in parsed results."""
+        try:
             # Check for uniform PMI (suggests no real effect)
-            pmis = [r['PMI'] for r in results['results']]
-            if len(set([round(pmi, 1) for pmi in pmis])) == 1:
+            pmis = np.fromiter((r[K_PMI] for r in results['results']), dtype=np.float64)
+            tenths = np.rint(pmis * 10.0)  # Quantize to one decimal place
+            if tenths.size and tenths.min() == tenths.max():
                 self.warnings.append("All PMI values very similar - check for simulation artifacts")
             
             # Check pressure scale usage
-            all_pressures = []
-            for result in results['results']:
-                all_pressures.extend([r['pressure'] for r in result['results_co_facilitative']])
-                all_pressures.extend([r['pressure'] for r in result['results_directive']])
+            rows = results['results']
+            columns = [_pressures(r, key, trials_key) for r in rows
+                       for key, trials_key in ((K_COFAC_FLAT, K_COFAC), (K_DIR_FLAT, K_DIR))]
+            all_pressures = np.concatenate(columns) if columns else np.empty(0, dtype=np.int64)
             
-            unique_pressures = set(all_pressures)
-            if len(unique_pressures) < 3:
-                self.warnings.append(f"Limited pressure scale usage ({len(unique_pressures)} values). May indicate simulation bias.")
+            n_unique = np.unique(all_pressures).size
+            if n_unique < 3:
+                self.warnings.append(f"Limited pressure scale usage ({n_unique} values). May indicate simulation bias.")
             
-            if max(all_pressures) < 3:
+            if all_pressures.max() < 3:
                 self.warnings.append("No high-pressure events observed. May indicate insufficient sensitivity.")
                 
         except Exception as e:
@@ -166,42 +313,43 @@ class StudyValidator:
     
     def generate_report(self) -> str:
         """Generate validation report."""
-        report = []
-        report.append("VALIDATION REPORT")
-        report.append("=" * 50)
-        report.append("")
+        buf = io.StringIO()
+        w = buf.write
+        w("VALIDATION REPORT\n")
+        w("=" * 50 + "\n")
+        w("\n")
         
         if not self.issues and not self.warnings:
-            report.append("✓ All validations passed successfully")
-            report.append("")
-            report.append("Study appears ready for:")
-            report.append("• Preliminary analysis")
-            report.append("• Method replication")
-            report.append("• Further data collection")
-            return "\n".join(report)
+            w("✓ All validations passed successfully\n")
+            w("\n")
+            w("Study appears ready for:\n")
+            w("• Preliminary analysis\n")
+            w("• Method replication\n")
+            w("• Further data collection")
+            return buf.getvalue()
         
         if self.issues:
-            report.append("CRITICAL ISSUES:")
-            report.append("-" * 20)
+            w("CRITICAL ISSUES:\n")
+            w("-" * 20 + "\n")
             for issue in self.issues:
-                report.append(f"✗ {issue}")
-            report.append("")
+                w(f"✗ {issue}\n")
+            w("\n")
         
         if self.warnings:
-            report.append("WARNINGS:")
-            report.append("-" * 10)
+            w("WARNINGS:\n")
+            w("-" * 10 + "\n")
             for warning in self.warnings:
-                report.append(f"⚠ {warning}")
-            report.append("")
+                w(f"⚠ {warning}\n")
+            w("\n")
         
         if self.issues:
-            report.append("❌ Validation FAILED - address critical issues before proceeding")
+            w("❌ Validation FAILED - address critical issues before proceeding")
         else:
-            report.append("⚠ Validation passed with warnings - review recommendations")
+            w("⚠ Validation passed with warnings - review recommendations")
         
-        return "\n".join(report)
+        return buf.getvalue()
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Validate tone-presence study')
     parser.add_argument('--protocol', default='protocols/observation_layer_v1_1.json',
                        help='Protocol file to validate')
@@ -212,33 +360,34 @@ def main():
     parser.add_argument('--strict', action='store_true',
                        help='Treat warnings as errors')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     validator = StudyValidator()
+    results_validator = StudyValidator()
     
-    # Validate protocol
+    # Protocol and results files are independent, so read and check them concurrently
     print("Validating protocol...")
-    if Path(args.protocol).exists():
-        validator.validate_protocol(args.protocol)
-    else:
-        validator.issues.append(f"Protocol file not found: {args.protocol}")
-    
-    # Validate results if available
-    if Path(args.results).exists():
-        print("Validating results...")
-        validator.validate_results(args.results)
-        validator.check_sample_size(args.results)
-        validator.detect_confounds(args.results)
-    else:
-        validator.warnings.append(f"Results file not found: {args.results}")
+    print("Validating results...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        checks = [executor.submit(validator.validate_protocol, args.protocol),
+                  executor.submit(results_validator.validate_all, args.results)]
+        for check in checks:
+            check.result()
+    
+    # Merge once both finish so report order does not depend on thread timing
+    validator.issues.extend(results_validator.issues)
+    validator.warnings.extend(results_validator.warnings)
     
     # Generate report
     report = validator.generate_report()
     
     # Save report
-    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-    with open(args.output, 'w') as f:
-        f.write(report)
+    # Write beside the target and swap it in, so readers never see a partial report
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + '.tmp')
+    tmp.write_text(report, encoding='utf-8')
+    os.replace(tmp, output)
     
     # Print to console
     print(report)
@@ -7,34 +7,89 @@ Validates results.json files against the defined schema for interoperability.
 
 import json
 import argparse
+import hashlib
+import importlib.util
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-def validate_results_schema(results_file: str, schema_file: str = "docs/results.schema.json") -> bool:
-    """Validate results file against JSON schema."""
-    
+from json_io import json_loads
+
+# Prefer fastjsonschema, which compiles the schema to Python code once
+try:
+    import fastjsonschema
+    jsonschema = None
+except ImportError:
+    fastjsonschema = None
     try:
         import jsonschema
     except ImportError:
-        print("Warning: jsonschema not installed. Install with: pip install jsonschema")
+        jsonschema = None
+
+# Generated validator modules, reused across runs until the schema changes
+_CACHE_DIR = Path(".cache")
+
+def _load_compiled_validator(schema_file: str):
+    """Import the fastjsonschema-generated validator for a schema, generating it if stale."""
+    path = Path(schema_file)
+    key = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:12]
+    version = fastjsonschema.VERSION.replace(".", "_")
+    cached = _CACHE_DIR / f"schema_{key}_{path.stat().st_mtime_ns}_{version}.py"
+    
+    if not cached.exists():
+        code = fastjsonschema.compile_to_code(json_loads(path.read_bytes()))
+        _CACHE_DIR.mkdir(exist_ok=True)
+        for stale in _CACHE_DIR.glob(f"schema_{key}_*.py"):
+            stale.unlink(missing_ok=True)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(code, encoding="utf-8")
+        os.replace(tmp, cached)
+    
+    spec = importlib.util.spec_from_file_location(cached.stem, cached)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.validate
+
+@lru_cache(maxsize=None)
+def _get_validator(schema_file: str):
+    """Load the schema and build its validator once per schema path."""
+    if fastjsonschema is not None:
+        return _load_compiled_validator(schema_file)
+    schema = json_loads(Path(schema_file).read_bytes())
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema).validate
+
+def validate_results_schema(results_file: str, schema_file: str = "docs/results.schema.json") -> bool:
+    """Validate results file against JSON schema."""
+    
+    if fastjsonschema is not None:
+        ValidationError = fastjsonschema.JsonSchemaValueException
+        SchemaError = fastjsonschema.JsonSchemaDefinitionException
+    elif jsonschema is not None:
+        ValidationError, SchemaError = jsonschema.ValidationError, jsonschema.SchemaError
+    else:
+        print("Warning: fastjsonschema not installed. Install with: pip install fastjsonschema")
         print("Skipping schema validation...")
         return True
     
-    # Load schema
+    # Load and compile schema
     try:
-        with open(schema_file) as f:
-            schema = json.load(f)
+        validate = _get_validator(schema_file)
     except FileNotFoundError:
         print(f"Error: Schema file {schema_file} not found")
         return False
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON in schema file: {e}")
         return False
+    except SchemaError as e:
+        print(f"Error: Invalid schema: {e}")
+        return False
     
     # Load results
     try:
-        with open(results_file) as f:
-            results = json.load(f)
+        results = json_loads(Path(results_file).read_bytes())
     except FileNotFoundError:
         print(f"Error: Results file {results_file} not found")
         return False
@@ -44,15 +99,14 @@ def validate_results_schema(results_file: str, schema_file: str = "docs/results.
     
     # Validate
     try:
-        jsonschema.validate(instance=results, schema=schema)
+        validate(results)
         print(f"✓ Results file {results_file} validates against schema")
         return True
-    except jsonschema.ValidationError as e:
+    except ValidationError as e:
+        # fastjsonschema paths start with the root name "data"
+        path = e.path[1:] if fastjsonschema is not None else e.path
         print(f"✗ Schema validation failed: {e.message}")
-        print(f"  Path: {' -> '.join(str(p) for p in e.path)}")
-        return False
-    except jsonschema.SchemaError as e:
-        print(f"Error: Invalid schema: {e}")
+        print(f"  Path: {' -> '.join(str(p) for p in path)}")
         return False
 
 def main():
@@ -67,4 +121,4 @@ def main():
     sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()